@@ -4,14 +4,18 @@ example usage: poetry run python aegis_decrypt.py -h
 """
 
 import argparse
+import csv
 import getpass
 import sys
+import time
 from os import path, getcwd
 from glob import glob
 from importlib.metadata import version
 
 from src.aegis_db import AegisDB
 from src.output import Output
+from src.totp_verifier import TOTPVerifier
+from src.vault_watcher import VaultWatcher
 
 
 def main() -> None:
@@ -61,12 +65,49 @@ def main() -> None:
         "--output",
         dest="output",
         required=False,
-        choices=["csv", "json", "otp", "otpauth", "qrcode", "stdout"],
+        choices=["csv", "json", "migration", "otp", "otpauth", "qrcode", "stdout"],
         default="otp",
         help="The output format. OTP generation is supported only for TOTP protocol. Default: %(default)s",
     )
+    parser.add_argument(
+        "--qr-version",
+        dest="qr_version",
+        type=int,
+        choices=range(10, 41),
+        metavar="{10..40}",
+        default=25,
+        help="The QR code version used by the migration output: higher versions pack more entries per QR code but are harder to scan. Versions below 10 cannot hold an entry, and entries with long names or secrets may need a version above 10. Default: %(default)s",
+    )
+    parser.add_argument(
+        "--watch",
+        dest="watch",
+        action="store_true",
+        help="Watch the --vault folder and produce the output for every new or changed vault file, until interrupted.",
+    )
+    parser.add_argument(
+        "--interval",
+        dest="interval",
+        type=float,
+        default=2.0,
+        help="Seconds between two scans of the folder in --watch mode. Default: %(default)s",
+    )
+    parser.add_argument(
+        "--verify",
+        dest="verify",
+        required=False,
+        help="A CSV file, or '-' for stdin, with 'entry,code[,timestamp]' rows to check instead of producing an output. The entry is its uuid or name, the timestamp defaults to now. Prints the matching time step offset of each row.",
+    )
+    parser.add_argument(
+        "--skew",
+        dest="skew",
+        type=int,
+        default=1,
+        help="Number of time steps accepted before and after the timestamp in --verify mode. Default: %(default)s",
+    )
 
     args = parser.parse_args()
+    if args.skew < 0:
+        parser.error("--skew must not be negative")
 
     if args.license:
         with open("LICENSE", "r") as file:
@@ -76,7 +117,26 @@ def main() -> None:
 
     if args.vault is None:
         args.vault = getcwd()
-        print(f"No vault specified. Using current directory: {args.vault}")
+        print(
+            f"No vault specified. Using current directory: {args.vault}",
+            file=_status_file(args),
+        )
+
+    if args.watch:
+        if not path.isdir(args.vault):
+            raise ValueError(f"--watch requires a folder, got: {args.vault}")
+        watcher = VaultWatcher(
+            args.vault,
+            _get_password(args),
+            lambda db: _export(db, args),
+            args.interval,
+        )
+        print(f"Watching {args.vault} for aegis-backup*.json vault files.")
+        try:
+            watcher.watch()
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+        return
 
     if path.isfile(args.vault):
         db = AegisDB(args.vault, _get_password(args))
@@ -87,24 +147,34 @@ def main() -> None:
 
         # Sort files by modification time (newest first)
         sorted_files = sorted(files, key=path.getmtime, reverse=True)
-        print(f"Using file {sorted_files[0]}")
+        print(f"Using file {sorted_files[0]}", file=_status_file(args))
         db = AegisDB(sorted_files[0], _get_password(args))
     else:
         raise ValueError(f"Invalid file or folder: {args.vault}")
 
+    _export(db, args)
+
+
+def _export(db: AegisDB, args) -> None:
     if args.search is not None:
         entries = db.search(args.search)
-        print(f"Found {len(entries)} entries matching search term '{args.search}'.")
+        print(
+            f"Found {len(entries)} entries matching search term '{args.search}'.",
+            file=_status_file(args),
+        )
     elif args.entryname is None and args.issuer is None:
         entries = db.get_all()
-        print(f"Found {len(entries)} entries.")
+        print(f"Found {len(entries)} entries.", file=_status_file(args))
     else:
         entries = db.get_by_name(args.entryname, args.issuer)
         print(
-            f"Found {len(entries)} entries filtering by {args.entryname} entry name and {args.issuer} issuer."
+            f"Found {len(entries)} entries filtering by {args.entryname} entry name and {args.issuer} issuer.",
+            file=_status_file(args),
         )
 
-    if entries:
+    if entries and args.verify is not None:
+        _verify(entries, args)
+    elif entries:
         output = Output(
             entries, args.entryname, path.dirname(db.get_db_path()), args.search
         )
@@ -116,6 +186,8 @@ def main() -> None:
                 output.qrcode()
             case "json":
                 output.json()
+            case "migration":
+                output.migration(args.qr_version)
             case "otp":
                 output.otp()
             case "otpauth":
@@ -124,7 +196,54 @@ def main() -> None:
                 output.stdout()
 
     else:
-        print("No entries found.")
+        print("No entries found.", file=_status_file(args))
+
+
+def _verify(entries: list, args) -> None:
+    verifier = TOTPVerifier(entries, args.skew)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["entry", "code", "timestamp", "offset"])
+
+    if args.verify == "-":
+        valid, total = _verify_rows(sys.stdin, verifier, writer)
+    else:
+        with open(args.verify, "r", newline="", encoding="utf-8") as file:
+            valid, total = _verify_rows(file, verifier, writer)
+
+    print(
+        f"Verified {valid} of {total} codes within a skew of {args.skew} steps.",
+        file=sys.stderr,
+    )
+
+
+def _verify_rows(file, verifier: TOTPVerifier, writer) -> tuple[int, int]:
+    valid = total = 0
+    for line, row in enumerate(csv.reader(file)):
+        row = [field.strip() for field in row]
+        if not row or (line == 0 and row[:2] == ["entry", "code"]):
+            continue
+        total += 1
+        try:
+            if len(row) < 2:
+                raise ValueError("expected an 'entry,code[,timestamp]' row")
+            entry_id, code = row[0], row[1]
+            # resolve "now" here, so that the output tells which time was used
+            timestamp = int(row[2]) if len(row) > 2 and row[2] else int(time.time())
+            offset = verifier.verify(entry_id, code, timestamp)
+        except (ValueError, IndexError) as e:
+            writer.writerow((row + ["", "", ""])[:3] + [f"ERROR: {e}"])
+            continue
+        if offset is None:
+            writer.writerow([entry_id, code, timestamp, "invalid"])
+        else:
+            valid += 1
+            writer.writerow([entry_id, code, timestamp, offset])
+    return valid, total
+
+
+def _status_file(args):
+    # in --verify mode stdout is kept for the CSV results only
+    return sys.stderr if args.verify is not None else sys.stdout
 
 
 def _get_password(args) -> str:
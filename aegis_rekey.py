@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+example usage: poetry run python aegis_rekey.py -h
+"""
+
+import argparse
+import getpass
+import sys
+from os import path
+from glob import glob
+
+from src.vault_rekey import VaultRekey
+
+
+def main() -> None:
+    """
+    Aegis rekey main function.
+    """
+    parser = argparse.ArgumentParser(
+        prog="aegis_rekey.py",
+        description="Change the password of many Aegis vaults at once. Only the master key in the password slots is re-encrypted, the vault content is left untouched. Vault files are replaced in place.",
+        add_help=True,
+    )
+    parser.add_argument(
+        "vaults",
+        nargs="+",
+        help="The encrypted Aegis vault files or folders. For folders, all the aegis-backup*.json files are considered.",
+    )
+    parser.add_argument(
+        "--password",
+        dest="password",
+        required=False,
+        help="The current vault password. Use it at your own risk since terminal history is usually saved on the device.",
+    )
+    parser.add_argument(
+        "--new-password",
+        dest="new_password",
+        required=False,
+        help="The new vault password. Use it at your own risk since terminal history is usually saved on the device.",
+    )
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        required=False,
+        help="Number of parallel processes. Default: the number of CPUs.",
+    )
+
+    args = parser.parse_args()
+
+    vault_paths = []
+    for vault in args.vaults:
+        if path.isfile(vault):
+            vault_paths.append(vault)
+        elif path.isdir(vault):
+            vault_paths.extend(sorted(glob(path.join(vault, "aegis-backup*.json"))))
+        else:
+            raise ValueError(f"Invalid file or folder: {vault}")
+    if not vault_paths:
+        raise ValueError("No aegis-backup*.json vault files found.")
+
+    if args.password is None:
+        args.password = getpass.getpass("Current password: ")
+    if args.new_password is None:
+        args.new_password = getpass.getpass("New password: ")
+        if args.new_password != getpass.getpass("Repeat new password: "):
+            raise ValueError("The new passwords do not match.")
+
+    results = VaultRekey(args.password, args.new_password, args.workers).rekey(
+        vault_paths
+    )
+
+    failed = 0
+    for vault_path, error in results.items():
+        if error is None:
+            print(f"Rekeyed {vault_path}")
+        else:
+            failed += 1
+            print(f"Skipped {vault_path}: {error}", file=sys.stderr)
+    print(f"Rekeyed {len(results) - failed} of {len(results)} vault files.")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
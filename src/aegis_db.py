@@ -10,18 +10,101 @@ from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 
 
+def slot_kdf_params(slot: dict) -> tuple:
+    """
+    The slot values that determine the derived key for a given password.
+    """
+    return (slot["salt"], slot["n"], slot["r"], slot["p"])
+
+
+def derive_key(password: bytes, slot: dict) -> bytes:
+    """
+    Derive the key of a password slot (type 1) with scrypt.
+    """
+    kdf = Scrypt(
+        salt=bytes.fromhex(slot["salt"]),
+        length=32,
+        n=slot["n"],
+        r=slot["r"],
+        p=slot["p"],
+        backend=default_backend(),
+    )
+    return kdf.derive(password)
+
+
+def filter_by_name(entries: list, name: str | None, issuer: str | None) -> list:
+    """
+    Filter the entries whose name and issuer contain the given substrings
+    (case-insensitive). None matches everything.
+    """
+    entries_found = []
+
+    for entry in entries:
+        db_name = entry.get("name", "")
+        db_issuer = entry.get("issuer", "")
+
+        # Looks also for substrings
+        if (name is None or name.lower() in db_name.lower()) and (
+            issuer is None or issuer.lower() in db_issuer.lower()
+        ):
+            entries_found.append(entry)
+
+    return entries_found
+
+
+def search_entries(entries: list, search_term: str) -> list:
+    """
+    Search for a string in all fields of all entries including note field.
+    Returns a list of entries that contain the search term (case-insensitive).
+    """
+    entries_found = []
+    search_lower = search_term.lower()
+
+    for entry in entries:
+        # Search in top-level string fields
+        if (
+            search_lower in entry.get("name", "").lower()
+            or search_lower in entry.get("issuer", "").lower()
+            or search_lower in entry.get("note", "").lower()
+            or search_lower in entry.get("uuid", "").lower()
+            or search_lower in entry.get("type", "").lower()
+        ):
+            entries_found.append(entry)
+            continue
+
+        # Search in info fields
+        info = entry.get("info", {})
+        if isinstance(info, dict):
+            for key, value in info.items():
+                if isinstance(value, str) and search_lower in value.lower():
+                    entries_found.append(entry)
+                    break
+                elif (
+                    isinstance(value, (int, float))
+                    and search_lower in str(value).lower()
+                ):
+                    entries_found.append(entry)
+                    break
+
+    return entries_found
+
+
 class AegisDB:
     """
     Class to decrypt and search inside the Aegis vault db.
     """
 
-    def __init__(self, db_path: str, password: str):
+    def __init__(self, db_path: str, password: str, key_cache: dict | None = None):
         """
         db_path and password: used for both encryption and decryption.
+        key_cache: optional dict shared between instances using the same password,
+        mapping the slot KDF parameters to the derived key so that scrypt runs
+        only once per distinct salt/params.
         """
         self._backend = default_backend()
         self._db_path = db_path
         self._password = password.encode("utf-8")
+        self._key_cache = key_cache if key_cache is not None else {}
 
     def encrypt(self, entries: dict) -> None:
         """
@@ -113,15 +196,7 @@ class AegisDB:
         master_key = None
         for slot in slots:
             # derive a key from the given password
-            kdf = Scrypt(
-                salt=bytes.fromhex(slot["salt"]),
-                length=32,
-                n=slot["n"],
-                r=slot["r"],
-                p=slot["p"],
-                backend=self._backend,
-            )
-            key = kdf.derive(self._password)
+            key = self._derive_key(slot)
 
             # try to use the derived key to decrypt the master key
             cipher = AESGCM(key)
@@ -160,6 +235,18 @@ class AegisDB:
 
         return json.loads(db.decode("utf-8"))
 
+    def _derive_key(self, slot: dict) -> bytes:
+        """
+        Derive the slot key from the password, reusing the cached key when the
+        slot salt and scrypt parameters have already been seen.
+        """
+        cache_key = slot_kdf_params(slot)
+        key = self._key_cache.get(cache_key)
+        if key is None:
+            key = derive_key(self._password, slot)
+            self._key_cache[cache_key] = key
+        return key
+
     def get_all(self) -> list:
         return self.decrypt()["entries"]
 
@@ -170,55 +257,14 @@ class AegisDB:
         return self.get_groups().get(uuid, "GROUP NOT FOUND")
 
     def get_by_name(self, name: str, issuer: str) -> list:
-        entries_found = []
-
-        for entry in self.get_all():
-            db_name = entry.get("name", "")
-            db_issuer = entry.get("issuer", "")
-
-            # Looks also for substrings
-            if (name is None or name.lower() in db_name.lower()) and (
-                issuer is None or issuer.lower() in db_issuer.lower()
-            ):
-                entries_found.append(entry)
-
-        return entries_found
+        return filter_by_name(self.get_all(), name, issuer)
 
     def search(self, search_term: str) -> list:
         """
         Search for a string in all fields of all entries including note field.
         Returns a list of entries that contain the search term (case-insensitive).
         """
-        entries_found = []
-        search_lower = search_term.lower()
-
-        for entry in self.get_all():
-            # Search in top-level string fields
-            if (
-                search_lower in entry.get("name", "").lower()
-                or search_lower in entry.get("issuer", "").lower()
-                or search_lower in entry.get("note", "").lower()
-                or search_lower in entry.get("uuid", "").lower()
-                or search_lower in entry.get("type", "").lower()
-            ):
-                entries_found.append(entry)
-                continue
-
-            # Search in info fields
-            info = entry.get("info", {})
-            if isinstance(info, dict):
-                for key, value in info.items():
-                    if isinstance(value, str) and search_lower in value.lower():
-                        entries_found.append(entry)
-                        break
-                    elif (
-                        isinstance(value, (int, float))
-                        and search_lower in str(value).lower()
-                    ):
-                        entries_found.append(entry)
-                        break
-
-        return entries_found
+        return search_entries(self.get_all(), search_term)
 
     def get_db_path(self) -> str:
         return self._db_path
@@ -0,0 +1,72 @@
+import asyncio
+import os
+from concurrent.futures import Executor
+
+from src.aegis_db import AegisDB, filter_by_name, search_entries
+
+# decryptions in flight, shared by all the instances opening the same vault
+# with the same password on the same event loop
+_INFLIGHT: dict[tuple, asyncio.Future] = {}
+
+
+class AsyncAegisDB:
+    """
+    Class to decrypt and search inside the Aegis vault db from asyncio code.
+    The file reading, the key derivation and the AES-GCM decryption run in an
+    executor, so that the event loop is never blocked.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        password: str,
+        key_cache: dict | None = None,
+        executor: Executor | None = None,
+    ):
+        """
+        db_path, password and key_cache: see AegisDB.
+        executor: where the blocking work runs. Default: the loop default executor.
+        """
+        self._db = AegisDB(db_path, password, key_cache)
+        self._executor = executor
+        self._inflight_key = (os.path.abspath(db_path), password)
+
+    async def decrypt(self) -> dict:
+        """
+        Decrypt the vault. Concurrent calls for the same vault, even from
+        different instances, share a single in-flight decryption, and so the
+        same returned dict: copy it before modifying it.
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop,) + self._inflight_key
+        inflight = _INFLIGHT.get(key)
+        if inflight is None:
+            inflight = loop.run_in_executor(self._executor, self._db.decrypt)
+            inflight.add_done_callback(lambda future: _clear_inflight(key, future))
+            _INFLIGHT[key] = inflight
+        # a cancelled caller must not cancel the decryption awaited by the others
+        return await asyncio.shield(inflight)
+
+    async def get_all(self) -> list:
+        return (await self.decrypt())["entries"]
+
+    async def get_groups(self) -> dict:
+        return (await self.decrypt())["groups"]
+
+    async def get_by_name(self, name: str, issuer: str) -> list:
+        return filter_by_name(await self.get_all(), name, issuer)
+
+    async def search(self, search_term: str) -> list:
+        """
+        Search for a string in all fields of all entries including note field.
+        Returns a list of entries that contain the search term (case-insensitive).
+        """
+        return search_entries(await self.get_all(), search_term)
+
+    def get_db_path(self) -> str:
+        return self._db.get_db_path()
+
+
+def _clear_inflight(key: tuple, future: asyncio.Future) -> None:
+    if _INFLIGHT.get(key) is future:
+        del _INFLIGHT[key]
@@ -1,3 +1,5 @@
+import hashlib
+import hmac
 import time
 from datetime import datetime
 import pyotp
@@ -5,16 +7,28 @@ import pyqrcode
 from pyqrcode import QRCode
 
 
+_DIGESTS = {
+    "SHA1": hashlib.sha1,
+    "SHA256": hashlib.sha256,
+    "SHA512": hashlib.sha512,
+}
+
+
 class EntryTOTP:
     """
     Class to handle the TOTP generation.
     """
 
+    # maximum number of time steps whose code is kept by verify()
+    _CODE_CACHE_SIZE = 1024
+
     def __init__(self, entry):
         self._entry = entry
         self._totp = pyotp.TOTP(
             entry["info"]["secret"], interval=entry["info"]["period"]
         )
+        self._hmac: hmac.HMAC | None = None
+        self._codes: dict[int, str] = {}
 
     def generate_code(self) -> str:
         """
@@ -48,6 +62,68 @@ class EntryTOTP:
             f"Unable to generate QR Code for entry {self._entry['name']} with issuer {self._entry['issuer']}"
         )
 
+    def verify(
+        self, code: str, timestamp: int | None = None, skew: int = 1
+    ) -> int | None:
+        """
+        Check a code against the time steps from -skew to +skew around the
+        timestamp (default: now), using the entry algorithm and digits.
+        Returns the offset of the matching time step, or None if no step matches.
+        """
+        if timestamp is None:
+            timestamp = int(time.time())
+        if timestamp < 0:
+            raise ValueError(f"Invalid negative timestamp {timestamp}")
+        counter = int(timestamp) // self._entry["info"]["period"]
+        code = str(code)
+        digits = self._entry["info"].get("digits", 6)
+        if not (code.isascii() and code.isdigit() and len(code) == digits):
+            raise ValueError(f"Invalid code {code}: expected {digits} digits")
+
+        # check the nearest time steps first
+        if hmac.compare_digest(self._code_at(counter), code):
+            return 0
+        for offset in range(1, skew + 1):
+            # time steps before the epoch have no code
+            if counter - offset >= 0 and hmac.compare_digest(
+                self._code_at(counter - offset), code
+            ):
+                return -offset
+            if hmac.compare_digest(self._code_at(counter + offset), code):
+                return offset
+        return None
+
+    def _code_at(self, counter: int) -> str:
+        """
+        Generate the code of a time step. The keyed HMAC state is built once
+        and copied for each step, and the codes are cached since many checks
+        usually hit the same few steps.
+        """
+        code = self._codes.get(counter)
+        if code is not None:
+            return code
+
+        if self._hmac is None:
+            algo = self._entry["info"].get("algo", "SHA1").upper()
+            if algo not in _DIGESTS:
+                raise ValueError(
+                    f"Unsupported algorithm {algo} for entry {self._entry['name']}"
+                )
+            self._hmac = hmac.new(self._totp.byte_secret(), digestmod=_DIGESTS[algo])
+
+        mac = self._hmac.copy()
+        mac.update(counter.to_bytes(8, "big"))
+        digest = mac.digest()
+        offset = digest[-1] & 0x0F
+        binary = int.from_bytes(digest[offset : offset + 4], "big") & 0x7FFFFFFF
+        digits = self._entry["info"].get("digits", 6)
+        code = str(binary % 10**digits).zfill(digits)
+
+        if len(self._codes) >= self._CODE_CACHE_SIZE:
+            self._codes.clear()
+        self._codes[counter] = code
+        return code
+
     def get_time_remaining(self) -> int:
         """
         Get the number of seconds remaining until the current TOTP expires
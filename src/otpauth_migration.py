@@ -0,0 +1,107 @@
+import base64
+import os
+from urllib.parse import quote
+
+import pyotp
+
+# Enum values of the Google Authenticator MigrationPayload protobuf message
+_ALGORITHMS = {"SHA1": 1, "SHA256": 2, "SHA512": 3, "MD5": 4}
+_DIGITS = {6: 1, 8: 2}
+_TYPES = {"hotp": 1, "totp": 2}
+
+_URL_PREFIX = "otpauth-migration://offline?data="
+
+# room left for the batch fields, whose final values are known only after
+# packing: 4 varint fields of up to 6 bytes, base64 encoded and, in the
+# worst case, fully percent-encoded
+_BATCH_FIELDS_RESERVE = (4 * 6 * 4 // 3 + 4) * 3
+
+
+def is_supported(entry: dict) -> bool:
+    """
+    Whether the entry can be exported in an otpauth-migration payload, which
+    has no period field and so only supports the default 30s period for TOTP.
+    """
+    info = entry.get("info", {})
+    return (
+        entry.get("type", "") in _TYPES
+        and info.get("algo", "SHA1").upper() in _ALGORITHMS
+        and info.get("digits", 6) in _DIGITS
+        and (entry["type"] != "totp" or info.get("period", 30) == 30)
+    )
+
+
+def pack_urls(entries: list, max_length: int) -> list[str]:
+    """
+    Pack the supported entries into as few otpauth-migration URLs as possible,
+    each one at most max_length characters long.
+    """
+    max_data_length = max_length - len(_URL_PREFIX) - _BATCH_FIELDS_RESERVE
+    batches: list[list[bytes]] = []
+    batch: list[bytes] = []
+    for entry in entries:
+        if not is_supported(entry):
+            continue
+        parameters = _length_delimited(1, _otp_parameters(entry))
+        if len(_url_data(parameters)) > max_data_length:
+            raise ValueError(
+                f"Entry {entry.get('name', '')} does not fit in a QR code of {max_length} characters"
+            )
+        if batch and len(_url_data(b"".join(batch + [parameters]))) > max_data_length:
+            batches.append(batch)
+            batch = []
+        batch.append(parameters)
+    if batch:
+        batches.append(batch)
+
+    batch_id = int.from_bytes(os.urandom(4), "big") & 0x7FFFFFFF
+    urls = []
+    for index, parameters_list in enumerate(batches):
+        payload = (
+            b"".join(parameters_list)
+            + _varint_field(2, 1)  # version
+            + _varint_field(3, len(batches))  # batch_size
+            + _varint_field(4, index)  # batch_index
+            + _varint_field(5, batch_id)  # batch_id
+        )
+        urls.append(_URL_PREFIX + _url_data(payload))
+    return urls
+
+
+def _otp_parameters(entry: dict) -> bytes:
+    info = entry["info"]
+    message = (
+        _length_delimited(1, pyotp.TOTP(info["secret"]).byte_secret())
+        + _length_delimited(2, entry.get("name", "").encode("utf-8"))
+        + _length_delimited(3, entry.get("issuer", "").encode("utf-8"))
+        + _varint_field(4, _ALGORITHMS[info.get("algo", "SHA1").upper()])
+        + _varint_field(5, _DIGITS[info.get("digits", 6)])
+        + _varint_field(6, _TYPES[entry["type"]])
+    )
+    if entry["type"] == "hotp":
+        message += _varint_field(7, info.get("counter", 0))
+    return message
+
+
+def _url_data(payload: bytes) -> str:
+    return quote(base64.b64encode(payload).decode("ascii"), safe="")
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _varint_field(field: int, value: int) -> bytes:
+    return _varint(field << 3) + _varint(value)
+
+
+def _length_delimited(field: int, value: bytes) -> bytes:
+    return _varint(field << 3 | 2) + _varint(len(value)) + value
@@ -3,6 +3,9 @@ import io
 import json
 import os
 
+import pyqrcode
+
+from src import otpauth_migration
 from src.entry_totp import EntryTOTP
 
 
@@ -176,6 +179,32 @@ class Output:
                     f"Entry {entry.get('name', ''):<45} - Issuer {entry.get('issuer', ''):<35} - OTP type not supported: {entry.get('type', ''):<6}"
                 )
 
+    def migration(self, qr_version: int = 25) -> None:
+        """
+        Save the entries as otpauth-migration QR codes, packing as many entries
+        as a QR code of the given version holds.
+        """
+        for entry in self._entries:
+            if not otpauth_migration.is_supported(entry):
+                print(
+                    f"Entry {entry.get('name', ''):<45} - Issuer {entry.get('issuer', ''):<35} - OTP type or parameters not supported: {entry.get('type', ''):<6}"
+                )
+
+        # the codes are scanned from a screen, so the lowest error correction
+        # level is enough and leaves room for more entries
+        error = "L"
+        max_length = pyqrcode.tables.data_capacity[qr_version][error][
+            pyqrcode.tables.modes["binary"]
+        ]
+        urls = otpauth_migration.pack_urls(self._entries, max_length)
+        for index, url in enumerate(urls, start=1):
+            img = pyqrcode.create(url, error=error, version=qr_version, mode="binary")
+            save_filename = (
+                self.file_path + f"_migration_{index:02}_of_{len(urls):02}.png"
+            )
+            img.png(save_filename, scale=4, background="#fff")
+            print(f"Migration QRCode {index} of {len(urls)} saved as: {save_filename}")
+
     def _print_note_context(self, note) -> None:
         note_context = self._get_note_context(note)
         if note_context:
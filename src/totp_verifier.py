@@ -0,0 +1,62 @@
+from collections.abc import Iterable
+
+from src.entry_totp import EntryTOTP
+
+
+class TOTPVerifier:
+    """
+    Class to check many TOTP codes against the entries of a vault.
+    """
+
+    def __init__(self, entries: list, skew: int = 1):
+        """
+        entries: the vault entries. Only TOTP entries can be verified.
+        skew: number of time steps accepted before and after the given timestamp.
+        """
+        if skew < 0:
+            raise ValueError(f"Invalid negative skew {skew}")
+        self._skew = skew
+        self._by_uuid: dict[str, EntryTOTP] = {}
+        self._by_name: dict[str, EntryTOTP | None] = {}
+
+        for entry in entries:
+            if entry.get("type", "") != "totp":
+                continue
+            totp = EntryTOTP(entry)
+            self._by_uuid[entry["uuid"]] = totp
+            name = entry.get("name", "").lower()
+            # a name shared by several entries is ambiguous: the uuid is needed
+            self._by_name[name] = None if name in self._by_name else totp
+
+    def verify(
+        self, entry_id: str, code: str, timestamp: int | None = None
+    ) -> int | None:
+        """
+        Check a code for the entry with the given uuid or name (case-insensitive).
+        Returns the offset of the matching time step, or None if the code is invalid.
+        """
+        return self._get_entry(entry_id).verify(code, timestamp, self._skew)
+
+    def verify_many(
+        self, checks: Iterable[tuple[str, str, int | None]]
+    ) -> list[int | None]:
+        """
+        Check many (entry uuid or name, code, timestamp) tuples.
+        """
+        return [
+            self._get_entry(entry_id).verify(code, timestamp, self._skew)
+            for entry_id, code, timestamp in checks
+        ]
+
+    def _get_entry(self, entry_id: str) -> EntryTOTP:
+        totp = self._by_uuid.get(entry_id)
+        if totp is not None:
+            return totp
+
+        name = entry_id.lower()
+        if name not in self._by_name:
+            raise ValueError(f"No TOTP entry found with uuid or name {entry_id}")
+        totp = self._by_name[name]
+        if totp is None:
+            raise ValueError(f"Several TOTP entries are named {entry_id}, use the uuid")
+        return totp
@@ -0,0 +1,182 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import cryptography
+import cryptography.exceptions
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from src.aegis_db import derive_key, slot_kdf_params
+
+
+class VaultRekey:
+    """
+    Class to change the password of many Aegis vault files at once.
+    Only the master key in the password slots is re-encrypted: the db payload,
+    its nonce and the master key itself are left untouched. The old key is
+    derived once per distinct salt/params, the new key once per rewrapped slot.
+    """
+
+    def __init__(
+        self, old_password: str, new_password: str, workers: int | None = None
+    ):
+        """
+        workers: number of processes used for key derivation and file rewriting.
+        Default: the number of CPUs.
+        """
+        self._old_password = old_password.encode("utf-8")
+        self._new_password = new_password.encode("utf-8")
+        self._workers = workers
+
+    def rekey(self, vault_paths: list[str]) -> dict[str, str | None]:
+        """
+        Rekey the given vault files in place.
+        Returns a dict mapping every vault path to None on success, or to the
+        error message if the vault was not changed.
+        """
+        results: dict[str, str | None] = dict.fromkeys(vault_paths)
+        headers = {}
+        for vault_path in vault_paths:
+            try:
+                headers[vault_path] = _read_password_slots(vault_path)
+            except (OSError, ValueError) as e:
+                results[vault_path] = str(e)
+
+        # the old key is derived once for each distinct salt/params
+        old_params = {
+            slot_kdf_params(slot): slot for slots in headers.values() for slot in slots
+        }
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            old_futures = {
+                params: executor.submit(derive_key, self._old_password, slot)
+                for params, slot in old_params.items()
+            }
+            old_keys = {}
+            derive_errors = {}
+            for params, future in old_futures.items():
+                try:
+                    old_keys[params] = future.result()
+                except Exception as e:
+                    # scrypt rejects some params (e.g. n not a power of 2): only
+                    # the vaults using them fail
+                    derive_errors[params] = str(e)
+
+            rewrap_futures = {}
+            for vault_path, slots in headers.items():
+                vault_params = [slot_kdf_params(slot) for slot in slots]
+                vault_keys = {
+                    params: old_keys[params]
+                    for params in vault_params
+                    if params in old_keys
+                }
+                if not vault_keys and vault_params:
+                    results[vault_path] = derive_errors[vault_params[0]]
+                    continue
+                rewrap_futures[vault_path] = executor.submit(
+                    _rewrap_vault, vault_path, vault_keys, self._new_password
+                )
+
+            for vault_path, rewrap_future in rewrap_futures.items():
+                try:
+                    rewrap_future.result()
+                except Exception as e:
+                    # the other vaults may already be rewritten: report every
+                    # failure against its own file instead of stopping
+                    results[vault_path] = str(e)
+
+        return results
+
+
+def _read_password_slots(vault_path: str) -> list:
+    with io.open(vault_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if not isinstance(data, dict) or not isinstance(data.get("header"), dict):
+        raise ValueError("'header' key is missing in the JSON file.")
+    if not isinstance(data["header"].get("slots"), list):
+        raise ValueError("'slots' key must have a list as its value in the JSON file.")
+
+    slots = [
+        slot
+        for slot in data["header"]["slots"]
+        if isinstance(slot, dict) and slot.get("type") == 1
+    ]
+    for slot in slots:
+        if not isinstance(slot.get("salt"), str) or not all(
+            isinstance(slot.get(param), int) for param in ("n", "r", "p")
+        ):
+            raise ValueError("Password slot with invalid 'salt', 'n', 'r' or 'p'.")
+        key_params = slot.get("key_params")
+        if (
+            not isinstance(slot.get("key"), str)
+            or not isinstance(key_params, dict)
+            or not isinstance(key_params.get("nonce"), str)
+            or not isinstance(key_params.get("tag"), str)
+        ):
+            raise ValueError("Password slot with invalid 'key' or 'key_params'.")
+    return slots
+
+
+def _rewrap_vault(vault_path: str, old_keys: dict, new_password: bytes) -> None:
+    """
+    Re-encrypt the master key of every password slot unlocked by the old
+    password and atomically replace the vault file. Like AegisDB.encrypt, every
+    new slot gets its own salt, so no two vaults share the derived key.
+    """
+    with io.open(vault_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    rewrapped = 0
+    for slot in data["header"]["slots"]:
+        if not isinstance(slot, dict) or slot.get("type") != 1:
+            continue
+
+        key = old_keys.get(slot_kdf_params(slot))
+        if key is None:
+            continue
+        params = slot["key_params"]
+        try:
+            master_key = AESGCM(key).decrypt(
+                nonce=bytes.fromhex(params["nonce"]),
+                data=bytes.fromhex(slot["key"]) + bytes.fromhex(params["tag"]),
+                associated_data=None,
+            )
+        except cryptography.exceptions.InvalidTag:
+            continue
+
+        n, r, p = 16384, 8, 1  # Standard Aegis Scrypt parameters
+        new_slot = {"salt": os.urandom(32).hex(), "n": n, "r": r, "p": p}
+        new_key = derive_key(new_password, new_slot)
+
+        nonce_key = os.urandom(12)
+        encrypted_master_key = AESGCM(new_key).encrypt(nonce_key, master_key, None)
+        slot.update(new_slot)
+        slot["key"] = encrypted_master_key[:-16].hex()
+        slot["key_params"] = {
+            "nonce": nonce_key.hex(),
+            "tag": encrypted_master_key[-16:].hex(),
+        }
+        rewrapped += 1
+
+    if rewrapped == 0:
+        raise ValueError("Unable to decrypt the master key with the given password.")
+
+    # write next to the vault and rename, so that the vault is never left
+    # half written
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(vault_path)), suffix=".tmp"
+    )
+    try:
+        with io.open(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(vault_path, tmp_path)
+        os.replace(tmp_path, vault_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
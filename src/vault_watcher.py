@@ -0,0 +1,90 @@
+import fnmatch
+import os
+import sys
+import time
+from collections.abc import Callable
+
+from src.aegis_db import AegisDB
+
+
+class VaultWatcher:
+    """
+    Class to watch a folder and decrypt the Aegis vaults that appear or change in it.
+    """
+
+    _VAULT_PATTERN = "aegis-backup*.json"
+
+    def __init__(
+        self,
+        folder: str,
+        password: str,
+        on_vault: Callable[[AegisDB], None],
+        interval: float = 2.0,
+    ):
+        """
+        folder: the directory to watch for aegis-backup*.json files.
+        on_vault: called with an unlocked AegisDB for every new or changed vault.
+        interval: seconds between two scans of the folder.
+        """
+        self._folder = folder
+        self._password = password
+        self._on_vault = on_vault
+        self._interval = interval
+        # derived keys are shared by all the vaults, so that scrypt runs only
+        # when a backup comes with a new salt or new KDF params
+        self._key_cache: dict = {}
+        self._seen: dict[str, tuple[int, int]] | None = None
+
+    def watch(self) -> None:
+        """
+        Poll the folder forever. Of the vaults already in the folder, only the
+        most recent one is processed on the first scan.
+        """
+        while True:
+            self.scan()
+            time.sleep(self._interval)
+
+    def scan(self) -> int:
+        """
+        Scan the folder once and process the new or changed vaults.
+        Returns the number of vaults processed.
+        """
+        first_scan = self._seen is None
+        seen = self._seen or {}
+        changed = []
+        current = {}
+        with os.scandir(self._folder) as it:
+            for dir_entry in it:
+                if not dir_entry.is_file() or not fnmatch.fnmatch(
+                    dir_entry.name, self._VAULT_PATTERN
+                ):
+                    continue
+                stat = dir_entry.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                current[dir_entry.path] = signature
+                if seen.get(dir_entry.path) != signature:
+                    changed.append((stat.st_mtime_ns, dir_entry.path))
+
+        # forget removed files, so that they are processed again if restored
+        self._seen = {p: s for p, s in seen.items() if p in current}
+
+        # like the directory mode, start from the most recent vault only: the
+        # older backups are just recorded as seen
+        if first_scan and changed:
+            changed = [max(changed)]
+            self._seen.update(current)
+
+        processed = 0
+        for _, vault_path in sorted(changed):
+            # a backup still being synced fails to parse, but it is retried as
+            # soon as its mtime or size changes again
+            self._seen[vault_path] = current[vault_path]
+            db = AegisDB(vault_path, self._password, self._key_cache)
+            try:
+                self._on_vault(db)
+            except Exception as e:
+                print(f"ERROR: unable to process {vault_path}: {e}", file=sys.stderr)
+                continue
+            processed += 1
+
+        return processed